@@ -1,100 +1,177 @@
+from __future__ import annotations
+
 from .opcodes import OPCODES
 from .addrtype import AddrType
-from re import match
+from codecs import escape_decode
+from sys import intern
+from typing import Callable
+import re, struct
+
+# precompiled patterns for label expressions (LABEL+1, LABEL-1) and instruction lines
+_EXPR_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)\s*([\+\-])\s*(\d+)$')
+_INSTR_RE = re.compile(r'^([A-Za-z]{2,3})(?:\s+(.*))?$')
+
+# mnemonics that take a relative branch operand
+_BRANCH_MNEMONICS = frozenset({'BCC', 'BCS', 'BEQ', 'BMI', 'BNE', 'BPL', 'BVC', 'BVS'})
+
+# indirect modes keyed by an operand's last three characters
+_INDIRECT_DISPATCH = {',X)': AddrType.INDX, '),Y': AddrType.INDY}
+
+# indexed modes keyed by an operand's last two characters: (absolute, zero page)
+_INDEXED_DISPATCH = {
+    ',X': (AddrType.ABSX, AddrType.ZPX),
+    ',Y': (AddrType.ABSY, AddrType.ZPY),
+}
+
+def _opcode_keys(name: str) -> tuple[tuple[str, AddrType], ...]:
+    """expand an OPCODES name like 'LDA_ABSX' into the (mnemonic, addrtype) keys it encodes."""
+    mnemonic, _, mode = name.partition('_')
+    if mode:
+        return ((intern(mnemonic), AddrType[mode]),)
+
+    # bare names cover implied, branch and raw byte operands
+    return tuple((intern(mnemonic), at) for at in (AddrType.IMPLIED, AddrType.REL, AddrType.BYTE))
+
+# opcode lookup keyed by (mnemonic, addrtype) instead of formatted strings
+_OPCODES_T: dict[tuple[str, AddrType], int] = {key: opcode for name, opcode in OPCODES.items() for key in _opcode_keys(name)}
+
+def _valid_modes() -> dict[str, int]:
+    """build a bitmask of the addressing modes (1 << AddrType) each mnemonic has an opcode for."""
+    modes: dict[str, int] = {}
+    for mnemonic, addrtype in _OPCODES_T:
+        modes[mnemonic] = modes.get(mnemonic, 0) | (1 << addrtype)
+    return modes
+
+_VALID_MODES = _valid_modes()
+
+# zero page / absolute counterparts of each mode: (zero page, absolute)
+_ZERO_PAGE_PAIRS: dict[AddrType, tuple[AddrType, AddrType]] = {
+    AddrType.ZP: (AddrType.ZP, AddrType.ABS),
+    AddrType.ABS: (AddrType.ZP, AddrType.ABS),
+    AddrType.ZPX: (AddrType.ZPX, AddrType.ABSX),
+    AddrType.ABSX: (AddrType.ZPX, AddrType.ABSX),
+    AddrType.ZPY: (AddrType.ZPY, AddrType.ABSY),
+    AddrType.ABSY: (AddrType.ZPY, AddrType.ABSY),
+}
+
+# cached struct packers for opcode + operand pairs
+_PACK_OP_U8 = struct.Struct('<BB').pack_into
+_PACK_OP_LE16 = struct.Struct('<BH').pack_into
+
+def _emit_u8(buf: bytearray, offset: int, opcode: int, v: int) -> int:
+    """write an opcode with a one byte operand into buf and return its size."""
+    _PACK_OP_U8(buf, offset, opcode, v & 0xFF)
+    return 2
+
+def _emit_le16(buf: bytearray, offset: int, opcode: int, v: int) -> int:
+    """write an opcode with a little-endian two byte operand into buf and return its size."""
+    _PACK_OP_LE16(buf, offset, opcode, v & 0xFFFF)
+    return 3
+
+# little-endian word writer for back-patches, and the modes whose operand is a word
+_PATCH_LE16 = struct.Struct('<H').pack_into
+_WORD_OPERANDS = frozenset({AddrType.ABS, AddrType.ABSX, AddrType.ABSY, AddrType.IND})
+
+# operand emitter per addressing mode (modes missing here have no operand bytes)
+_OPERAND_EMITTERS: dict[AddrType, Callable[[bytearray, int, int, int], int]] = {
+    AddrType.IMM: _emit_u8,
+    AddrType.ZP: _emit_u8,
+    AddrType.ZPX: _emit_u8,
+    AddrType.ZPY: _emit_u8,
+    AddrType.INDX: _emit_u8,
+    AddrType.INDY: _emit_u8,
+    AddrType.ABS: _emit_le16,
+    AddrType.ABSX: _emit_le16,
+    AddrType.ABSY: _emit_le16,
+    AddrType.IND: _emit_le16,
+}
 
 class Assembler:
-    def __init__(self, origin=0xA000):
+    def __init__(self, origin: int = 0xA000) -> None:
         """initialize the assembler with an origin address."""
-        # init labels, output, and a private lines list
-        self.labels = {}
+        # init labels, output, and a private list of back-patches for forward label references
+        self.labels: dict[str, int] = {}
         self.output = bytearray()
-        self._lines = []
+        self._patches: list[tuple[int, AddrType, str, int]] = []
+
+        # memoized parse_operand / resolve_value results (cleared per assembly run, only defined labels are cached)
+        self._operand_cache: dict[tuple[str | None, str], tuple[AddrType, str | None]] = {}
+        self._value_cache: dict[str, int] = {}
 
-        # address where the assembled code starts loading
+        # default start address; assembly begins here unless the source says .org
         self.origin = origin
         self.pc = origin
+        self._start = origin
 
+        # after assembly: the address the returned image loads at (the lowest emitted address),
+        # and the entry point (the first instruction, or origin when there is none)
+        self.image_base = origin
+        self.entry = origin
 
-    def parse_operand(self, operand, mnemonic=None):
-        """parse an operand and return its addressing type and value."""
-        operand = operand.strip()
+        # lowest and highest address occupied by the program, tracked while emitting
+        self._pc_min = 0x10000
+        self._pc_max = 0
 
-        # immediate
-        if operand.startswith('#'):
-            value = operand[1:]
-            return AddrType.IMM, value
 
-        # indirect,X
-        if operand.startswith('(') and operand.endswith(',X)'):
-            value = operand[1:-3]
-            return AddrType.INDX, value
+    def parse_operand(self, operand: str, mnemonic: str | None = None) -> tuple[AddrType, str | None]:
+        """parse an operand and return its addressing type and value."""
+        key = (mnemonic, operand)
+        cached = self._operand_cache.get(key)
+        if cached is None:
+            cached = self._operand_cache[key] = self._parse_operand(operand, mnemonic)
+        return cached
 
-        # (indirect),Y
-        if operand.startswith('(') and operand.endswith('),Y'):
-            value = operand[1:-3]
-            return AddrType.INDY, value
 
-        # indirect JMP
-        if operand.startswith('(') and operand.endswith(')'):
-            value = operand[1:-1]
-            return AddrType.IND, value
+    def _parse_operand(self, operand: str, mnemonic: str | None) -> tuple[AddrType, str | None]:
+        """uncached body of parse_operand."""
+        operand = operand.strip()
 
-        # absolute,X
-        if operand.endswith(',X'):
-            value = operand[:-2]
-            if value.startswith('$') or value.isdigit() or value.isidentifier():
-                return AddrType.ABSX, value.strip()
+        # implied
+        if not operand:
+            return AddrType.IMPLIED, None
 
-        # absolute,Y
-        if operand.endswith(',Y'):
-            value = operand[:-2]
-            if value.startswith('$') or value.isdigit() or value.isidentifier():
-                return AddrType.ABSY, value.strip()
+        # immediate and indirect forms are decided by the leading character
+        head = operand[0]
+        if head == '#':
+            return AddrType.IMM, operand[1:]
 
-        # zero page,X
-        if operand.endswith(',X'):
-            value = operand[:-2]
-            if value.startswith('$') and len(value) <= 3:
-                return AddrType.ZPX, value.strip()
+        if head == '(':
+            # (indirect,X) and (indirect),Y
+            addrtype = _INDIRECT_DISPATCH.get(operand[-3:])
+            if addrtype is not None:
+                return addrtype, operand[1:-3]
 
-        # zero page,Y
-        if operand.endswith(',Y'):
+            # indirect JMP
+            if operand[-1] == ')':
+                return AddrType.IND, operand[1:-1]
+
+        # indexed forms are decided by the trailing ",X" / ",Y"
+        modes = _INDEXED_DISPATCH.get(operand[-2:])
+        if modes is not None:
             value = operand[:-2]
-            if value.startswith('$') and len(value) <= 3:
-                return AddrType.ZPY, value.strip()
+            if value.startswith('$') or value.isdigit() or value.isidentifier():
+                absmode, zpmode = modes
+                if self._fits_zero_page(value):
+                    return zpmode, value.strip()
+                return absmode, value.strip()
 
         # accumulator
         if operand.upper() == 'A':
             return AddrType.ACC, None
 
-        # implied
-        if operand == '':
-            return AddrType.IMPLIED, None
-
         # branch instructions
-        branch_mnemonics = {
-            'BCC', 'BCS', 'BEQ', 'BMI', 'BNE', 'BPL', 'BVC', 'BVS'
-        }
-        if mnemonic in branch_mnemonics and operand.isidentifier():
+        if mnemonic in _BRANCH_MNEMONICS and operand.isidentifier():
             return AddrType.REL, operand
 
-        # absolute or zero page
-        if operand.startswith('$'):
-            if len(operand) <= 3:
-                return AddrType.ZP, operand
-            else:
-                return AddrType.ABS, operand
-
-        # decimal
-        if operand.isdigit():
-            val = int(operand)
-            if val < 0x100:
+        # absolute or zero page, hex or decimal
+        if head == '$' or operand.isdigit():
+            if self._fits_zero_page(operand):
                 return AddrType.ZP, operand
             else:
                 return AddrType.ABS, operand
 
         # label expressions like LABEL+1 or LABEL-1
-        expr_match = match(r'^([A-Za-z_][A-Za-z0-9_]*)\s*([\+\-])\s*(\d+)$', operand)
+        expr_match = _EXPR_RE.match(operand)
         if expr_match:
             # We don't know the value yet, so treat as ABS for now
             return AddrType.ABS, operand
@@ -107,17 +184,54 @@ class Assembler:
         return AddrType.BYTE, operand
 
 
-    def parse_line(self, line):
-        """parse a single line of assembly code and return its type and content."""
-        # remove comments
-        line = line.split(';', 1)[0].strip()
+    def fit_mode(self, mnemonic: str, addrtype: AddrType, value: str | None) -> AddrType:
+        """pick the zero page or absolute form of a mode, whichever the mnemonic has and the operand fits."""
+        pair = _ZERO_PAGE_PAIRS.get(addrtype)
+        if pair is None:
+            return addrtype
+
+        zpmode, absmode = pair
+        if not _VALID_MODES.get(mnemonic, 0) & (1 << zpmode):
+            return absmode
+
+        # literal widths are kept as written, labels placed below $100 shrink to zero page
+        if addrtype == zpmode or value is None or value[0] == '$' or value.isdigit():
+            return addrtype
+        if value.isidentifier() and value not in self.labels:
+            return addrtype
+
+        try:
+            resolved = self.resolve_value(value)
+        except ValueError:
+            return addrtype
+        return zpmode if 0 <= resolved < 0x100 else addrtype
+
+
+    def _fits_zero_page(self, value: str) -> bool:
+        """check if a literal operand ($NN or decimal < 256) addresses the zero page."""
+        if value.startswith('$'):
+            return len(value) <= 3
+        return value.isdigit() and int(value) < 0x100
+
+
+    def parse_line(self, line: str, lower: str | None = None) -> list[tuple]:
+        """parse a single comment-free, stripped line of assembly code and return a list of (type, content) tokens."""
         if not line:
-            return None
-        
-        # label
-        if line.endswith(':'):
-            return ('label', line[:-1].strip())
-        lower = line.lower()
+            return []
+
+        # label, optionally followed by a directive or instruction on the same line
+        lbl, sep, rest = line.partition(':')
+        if sep and lbl.strip().isidentifier():
+            return [('label', lbl.strip())] + self.parse_line(rest.strip())
+
+        parsed = self.parse_statement(line, lower)
+        return [parsed] if parsed else []
+
+
+    def parse_statement(self, line: str, lower: str | None = None) -> tuple | None:
+        """parse a comment-free directive or instruction and return its type and content."""
+        if lower is None:
+            lower = line.lower()
 
         # .org directive
         if lower.startswith('.org'):
@@ -151,198 +265,154 @@ class Assembler:
             return ('string', arg, False)
         
         # instruction
-        m = match(r'^([A-Za-z]{2,3})(?:\s+(.*))?$', line)
+        m = _INSTR_RE.match(line)
         if m:
-            mnemonic = m.group(1).upper()
-            operand = m.group(2) or ''
-            return ('instr', mnemonic, operand.strip())
+            mnemonic = intern(m.group(1).upper())
+            operand = (m.group(2) or '').strip()
+
+            # label operands are interned so later symbol lookups reuse the cached hash
+            if operand.isidentifier():
+                operand = intern(operand)
+            return ('instr', mnemonic, operand)
         
         return None
 
 
-    def first_pass(self, lines):
-        """first pass to collect labels and calculate program counter."""
-        self.pc = self.origin
-        for line in lines:
-            code = line.split(';', 1)[0].strip()
+    def emit_pass(self, lines: list[str], lowered: list[str]) -> None:
+        """single pass over cleaned lines that places labels and emits code, back-patching labels not yet defined."""
+        # emit straight into a buffer indexed by address, the occupied span is sliced out at the end
+        output = self.output = bytearray(0x10000)
+        self.pc = self._start
+        self._patches = []
 
-            if ':' in code:
-                lbl, rest = code.split(':', 1)
-                lbl = lbl.strip()
-                self.labels[lbl] = self.pc
-                self._lines.append((lbl + ':', ('label', lbl)))
+        # lowest and highest address occupied by the program, and the first instruction's address
+        self._pc_min = 0x10000
+        self._pc_max = 0
+        entry: int | None = None
 
-                if rest.strip():
-                    parsed_rest = self.parse_line(rest)
+        for line, lower in zip(lines, lowered):
+            for parsed in self.parse_line(line, lower):
+                kind = parsed[0]
+                start = self.pc
 
-                    if parsed_rest:
-                        kind = parsed_rest[0]
+                if kind == 'label':
+                    self.labels[intern(parsed[1])] = self.pc
+                    continue
 
-                        if kind == 'org':
-                            self.pc = parsed_rest[1]
+                elif kind == 'org':
+                    self.pc = parsed[1]
+                    continue
 
-                        elif kind == 'word':
-                            self.pc += 2 * len(parsed_rest[1])
+                elif kind == 'word':
+                    # resolve the whole table, then pack it in one call
+                    vals = [self._resolve_or_patch(val, start + 2*i, AddrType.ABS, start) & 0xFFFF for i, val in enumerate(parsed[1])]
+                    output[start:start+2*len(vals)] = struct.pack(f'<{len(vals)}H', *vals)
+                    self.pc += 2 * len(vals)
 
-                        elif kind == 'byte':
-                            self.pc += len(parsed_rest[1])
+                elif kind == 'byte':
+                    data = bytes([self._resolve_or_patch(val, start + i, AddrType.BYTE, start) & 0xFF for i, val in enumerate(parsed[1])])
+                    output[start:start+len(data)] = data
+                    self.pc += len(data)
 
-                        elif kind == 'res':
-                            self.pc += parsed_rest[1]
+                elif kind == 'res':
+                    # reserved space (e.g. zero page variables) is not emitted, so it doesn't widen the span
+                    self.pc += parsed[1]
+                    continue
 
-                        elif kind == 'instr':
-                            mnem, op = parsed_rest[1], parsed_rest[2]
-                            at, _ = self.parse_operand(op, mnem)
-                            self.pc += self.instr_size(at)
-                        self._lines.append((rest, parsed_rest))
-                continue
+                elif kind == 'instr':
+                    if entry is None:
+                        entry = start
+                    at, value = self.parse_operand(parsed[2], parsed[1])
+                    at = self.fit_mode(parsed[1], at, value)
+                    self.pc += self.encode_instr(parsed[1], at, value, start, output, start)
 
-            parsed = self.parse_line(line)
-            if not parsed:
-                continue
-            kind = parsed[0]
-            
-            if kind == 'label':
-                self.labels[parsed[1]] = self.pc
+                elif kind == 'string':
+                    s = parsed[1]
+                    if s.startswith('"') and s.endswith('"'):
+                        bytestr = escape_decode(s[1:-1].encode())[0]
 
-            elif kind == 'org':
-                self.pc = parsed[1]
+                    else:
+                        bytestr = s.encode('ascii')
 
-            elif kind == 'word':
-                self.pc += 2 * len(parsed[1])
-                
-            elif kind == 'byte':
-                self.pc += len(parsed[1])
+                    if parsed[2]:
+                        bytestr += b'\0'
 
-            elif kind == 'res':
-                self.pc += parsed[1]
+                    output[start:start+len(bytestr)] = bytestr
+                    self.pc += len(bytestr)
 
-            elif kind == 'instr':
-                mnem, op = parsed[1], parsed[2]
-                at, _ = self.parse_operand(op, mnem)
-                self.pc += self.instr_size(at)
+                self._pc_min = min(self._pc_min, start)
+                self._pc_max = max(self._pc_max, self.pc)
 
-            elif kind == 'string':
-                s = parsed[1]
-                if s.startswith('"') and s.endswith('"'):
-                    slen = len(eval(s))
+        self.entry = self._start if entry is None else entry
 
-                else:
-                    slen = len(s)
 
-                if parsed[2]:
-                    slen += 1
+    def patch_pass(self) -> bytearray:
+        """fill in the forward label references recorded by emit_pass and return the occupied span."""
+        output = self.output
+        for offset, addrtype, value, pc in self._patches:
+            # addrtype only picks how the patch is written: branch offset, little-endian word or single byte
+            if addrtype == AddrType.REL:
+                if value not in self.labels:
+                    raise ValueError(f"Unknown branch label: {value}")
+                output[offset] = (self.labels[value] - (pc + 2)) & 0xFF
 
-                self.pc += slen
-            self._lines.append((line, parsed))
+            elif addrtype in _WORD_OPERANDS:
+                _PATCH_LE16(output, offset, self.resolve_value(value) & 0xFFFF)
 
+            else:
+                output[offset] = self.resolve_value(value) & 0xFF
 
-    def instr_size(self, addrtype):
-        """return the size of the instruction based on its addressing mode."""
-        # instruction size by addressing mode
-        if addrtype in (AddrType.IMPLIED, AddrType.ACC):
-            return 1
-        
-        if addrtype == AddrType.IMM:
-            return 2
-        
-        if addrtype in (AddrType.ZP, AddrType.ZPX, AddrType.ZPY, AddrType.INDX, AddrType.INDY, AddrType.REL):
-            return 2
-        
-        if addrtype in (AddrType.ABS, AddrType.ABSX, AddrType.ABSY, AddrType.IND):
-            return 3
-        
-        if addrtype == AddrType.BYTE:
-            return 1
-        return 1
-
-
-    def second_pass(self):
-        """second pass to generate the binary output."""
-        # preallocate a buffer covering addresses from self.origin to 0x10000
-        SIZE = 0x10000 - self.origin
-        self.output = bytearray(SIZE)
-        self.pc = self.origin
-        max_written = 0
-
-        for line, parsed in self._lines:
-            if not parsed: continue
-            kind = parsed[0]
-
-            if kind == 'label':
-                continue
-
-            elif kind == 'org':
-                self.pc = parsed[1]
-
-            elif kind == 'word':
-                for val in parsed[1]:
-                    addr_val = self.resolve_value(val)
-                    offset = self.pc - self.origin
-                    self.output[offset:offset+2] = bytes([addr_val & 0xFF, (addr_val >> 8) & 0xFF])
-                    max_written = max(max_written, offset+2)
-                    self.pc += 2
-
-            elif kind == 'byte':
-                for val in parsed[1]:
-                    b = self.resolve_value(val) & 0xFF
-                    offset = self.pc - self.origin
-                    self.output[offset] = b
-                    max_written = max(max_written, offset+1)
-                    self.pc += 1
-
-            elif kind == 'res':
-                self.pc += parsed[1]
-
-            elif kind == 'instr':
-                mnem, op = parsed[1], parsed[2]
-                at, value = self.parse_operand(op, mnem)
-                opcode, ops = self.encode_instr(mnem, at, value, self.pc)
-                offset = self.pc - self.origin
-                self.output[offset] = opcode
-                self.output[offset+1:offset+1+len(ops)] = ops
-                max_written = max(max_written, offset+1+len(ops))
-                self.pc += 1 + len(ops)
-
-            elif kind == 'string':
-                s = parsed[1]
-                nullterm = parsed[2]
-                if s.startswith('"') and s.endswith('"'):
-                    bytestr = bytes(s[1:-1], "utf-8").decode("unicode_escape").encode("ascii")
+        # trim the buffer to the addresses the program occupies, which start at image_base
+        if self._pc_min >= self._pc_max:
+            self.image_base = self._start
+            return bytearray()
+        self.image_base = self._pc_min
+        return output[self._pc_min:self._pc_max]
 
-                else:
-                    bytestr = s.encode('ascii')
 
-                offset = self.pc - self.origin
-                self.output[offset:offset+len(bytestr)] = bytestr
-                max_written = max(max_written, offset+len(bytestr))
-                self.pc += len(bytestr)
+    def _resolve_or_patch(self, value: str, offset: int, addrtype: AddrType, pc: int) -> int:
+        """resolve a value now, or record a back-patch at offset and return a placeholder if it is not yet resolvable."""
+        # operands already resolved on an earlier line are reused directly
+        cached = self._value_cache.get(value)
+        if cached is not None:
+            return cached
 
-                if nullterm:
-                    offset = self.pc - self.origin
-                    self.output[offset] = 0
-                    max_written = max(max_written, offset+1)
-                    self.pc += 1
+        # a bare label that has not been placed yet goes straight to the patch list
+        if value.isidentifier() and value not in self.labels:
+            self._patches.append((offset, addrtype, value, pc))
+            return 0
 
-        # return the buffer up to the highest address written or the final PC offset, whichever is larger.
-        end = max(self.pc - self.origin, max_written)
-        return self.output[:end]
+        try:
+            return self.resolve_value(value)
+        except ValueError:
+            # unknown labels are retried once the whole source has been seen, real errors surface there
+            self._patches.append((offset, addrtype, value, pc))
+            return 0
 
 
-    def resolve_value(self, val):
+    def resolve_value(self, val: str) -> int:
         """resolve a value to its numeric representation."""
+        cached = self._value_cache.get(val)
+        if cached is not None:
+            return cached
+
+        resolved = self._value_cache[val] = self._resolve_value(val)
+        return resolved
+
+
+    def _resolve_value(self, val: str) -> int:
+        """uncached body of resolve_value."""
         val = val.strip()
         # handle character literals enclosed in single quotes
         if len(val) >= 2 and val[0] == "'" and val[-1] == "'":
             return ord(val[1:-1])
 
-        # handle operands with indexing, e.g., "LABEL,X" or "LABEL,Y"
-        if isinstance(val, str) and ',' in val:
-            base, reg = val.split(',')
-            return self.resolve_value(base.strip())
+        # handle operands with indexing, e.g., "LABEL,X" or "LABEL,Y" by resolving just the base
+        if ',' in val:
+            val = val.split(',', 1)[0].strip()
 
         # handle expressions like LABEL+1 or LABEL-1
-        expr_match = match(r'^([A-Za-z_][A-Za-z0-9_]*)\s*([\+\-])\s*(\d+)$', val)
+        expr_match = _EXPR_RE.match(val)
         if expr_match:
             base_label = expr_match.group(1)
             op = expr_match.group(2)
@@ -362,101 +432,53 @@ class Assembler:
         elif val.isdigit():
             return int(val)
 
-        elif val in self.labels:
+        # labels (keys are interned when defined)
+        val = intern(val)
+        if val in self.labels:
             return self.labels[val]
 
         # if value is a number literal or label, resolve it here.
         raise ValueError(f"Unknown value: {val}")
 
 
-    def encode_instr(self, mnemonic, addrtype, value, pc):
-        """encode an instruction into its opcode and operand bytes."""
+    def encode_instr(self, mnemonic: str, addrtype: AddrType, value: str | None, pc: int, buf: bytearray, offset: int) -> int:
+        """encode an instruction into buf at offset and return the number of bytes written."""
         # map mnemonic + addressing mode to opcode
-        key = None
-        operand_bytes = b''
-
-        if addrtype == AddrType.IMM:
-            key = f"{mnemonic}_IMM"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF])
-
-        elif addrtype == AddrType.ZP:
-            key = f"{mnemonic}_ZP"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF])
-
-        elif addrtype == AddrType.ZPX:
-            key = f"{mnemonic}_ZPX"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF])
-
-        elif addrtype == AddrType.ZPY:
-            key = f"{mnemonic}_ZPY"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF])
-
-        elif addrtype == AddrType.ABS:
-            key = f"{mnemonic}_ABS"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF, (v >> 8) & 0xFF])
-
-        elif addrtype == AddrType.ABSX:
-            key = f"{mnemonic}_ABSX"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF, (v >> 8) & 0xFF])
-
-        elif addrtype == AddrType.ABSY:
-            key = f"{mnemonic}_ABSY"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF, (v >> 8) & 0xFF])
-
-        elif addrtype == AddrType.IND:
-            key = f"{mnemonic}_IND"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF, (v >> 8) & 0xFF])
-
-        elif addrtype == AddrType.INDX:
-            key = f"{mnemonic}_INDX"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF])
-
-        elif addrtype == AddrType.INDY:
-            key = f"{mnemonic}_INDY"
-            v = self.resolve_value(value)
-            operand_bytes = bytes([v & 0xFF])
-
-        elif addrtype == AddrType.ACC:
-            key = f"{mnemonic}_ACC"
-
-        elif addrtype == AddrType.IMPLIED:
-            key = mnemonic
-
-        elif addrtype == AddrType.REL:
-            key = mnemonic
-            if value in self.labels:
-                target = self.labels[value]
-                offset = (target - (pc + 2)) & 0xFF
-                operand_bytes = bytes([offset])
+        opcode = _OPCODES_T.get((mnemonic, addrtype))
+        if opcode is None:
+            raise ValueError(f"Opcode not found for line: {mnemonic} ({addrtype.name}) {value}")
 
-            else:
-                raise ValueError(f"Unknown branch label: {value}")
-            
-        elif addrtype == AddrType.BYTE:
-            key = mnemonic
+        # implied and accumulator forms parse no operand value
+        if value is None:
+            buf[offset] = opcode
+            return 1
 
-        else:
-            raise ValueError(f"Unknown addressing mode for {mnemonic} {value}")
-        
-        if key not in OPCODES:
-            raise ValueError(f"Opcode not found for line: {key} {value}")
-        
-        opcode = OPCODES[key]
-        return opcode, operand_bytes
+        # branches encode a signed offset from the next instruction, forward branches are patched later
+        if addrtype == AddrType.REL:
+            if value not in self.labels:
+                self._patches.append((offset + 1, addrtype, value, pc))
+                return _emit_u8(buf, offset, opcode, 0)
+            return _emit_u8(buf, offset, opcode, self.labels[value] - (pc + 2))
+
+        # raw byte forms have no operand either
+        emit = _OPERAND_EMITTERS.get(addrtype)
+        if emit is None:
+            buf[offset] = opcode
+            return 1
+        return emit(buf, offset, opcode, self._resolve_or_patch(value, offset + 1, addrtype, pc))
 
 
-    def assemble(self, text):
+    def assemble(self, text: str) -> bytearray:
         """assemble the provided assembly code text into binary."""
-        # split lines and make two passes
-        lines = text.splitlines()
-        self.first_pass(lines)
-        return self.second_pass()
\ No newline at end of file
+        # drop labels, pending patches and state memoized by a previous run, so a
+        # reused assembler can't treat an old label as already defined
+        self.labels.clear()
+        self._patches.clear()
+        self._operand_cache.clear()
+        self._value_cache.clear()
+
+        # strip comments and whitespace once up front, then emit and back-patch
+        cleaned = [line.split(';', 1)[0].strip() for line in text.splitlines()]
+        lowered = [line.lower() for line in cleaned]
+        self.emit_pass(cleaned, lowered)
+        return self.patch_pass()
\ No newline at end of file
@@ -1,4 +1,7 @@
 from enum import IntEnum
+import struct
+
+from core.asm.opcodes import OPCODES
 
 class Flag(IntEnum):
     """processor status flags."""
@@ -11,7 +14,150 @@ class Flag(IntEnum):
     V = 0x40  # overflow flag
     N = 0x80  # negative flag
 
+# status bits as plain ints for the hot path (no enum attribute lookup or coercion)
+C, Z, I, D, B, U, V, N = 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80
+_ZN_MASK = 0x7D    # keeps everything but N and Z
+_C_MASK = 0xFE     # keeps everything but C
+_V_MASK = 0xBF     # keeps everything but V
+_VC_MASK = 0xBE    # keeps everything but V and C
+
+# result byte -> its Z and N bits
+_ZN = bytes((0 if v else Z) | (v & N) for v in range(256))
+
+# little-endian word at an offset (the caller handles the $FFFF wrap)
+_WORD = struct.Struct('<H').unpack_from
+_PUT_WORD = struct.Struct('<H').pack_into
+
+# branch operand byte -> signed offset
+_REL = tuple(i if i < 0x80 else i - 0x100 for i in range(256))
+
+def _build_adc_table():
+    """binary add with carry for every (A, value, carry): result byte, then its C and V bits."""
+    table = bytearray(0x40000)
+    i = 0
+    for a in range(256):
+        for value in range(256):
+            for carry in (0, 1):
+                result = a + value + carry
+                table[i] = result & 0xFF
+                table[i + 1] = (result >> 8) | ((~(a ^ value) & (a ^ result) & 0x80) >> 1)
+                i += 2
+    return bytes(table)
+
+# ((A << 9) | (value << 1) | carry) << 1 -> result, C|V; sbc indexes it with value ^ 0xFF
+_ADC = _build_adc_table()
+
+# --- fused handler generation ---
+# every operand-taking opcode in the assembler's OPCODES table gets its own handler,
+# generated from the snippets below: the operand decode, the memory access and the
+# operation are pasted into one function body so a dispatch is one call and all the
+# work happens on locals.
+
+def _read_src(dst, addr):
+    """source for a handler-aware read of addr into dst."""
+    return f"{dst} = ram[{addr}] if {addr} not in self._read_handlers else self._read_handlers[{addr}]({addr})"
+
+def _write_src(mode):
+    """source for a write of value to addr; zero page can never hit a ROM bank."""
+    check = "addr not in self._write_handlers"
+    if not mode.startswith('ZP'):
+        check = "addr < 0xA000 and " + check
+    return f"if {check}:\n    ram[addr] = value\nelse:\n    self.memory.write(addr, value)"
+
+# two-byte operand at pc, in one unpack unless it straddles $FFFF/$0000
+_OPERAND_WORD_SRC = "addr = _WORD(ram, pc)[0] if pc != 0xFFFF else ram[pc] | (ram[0] << 8)"
+
+# addressing mode -> (source leaving the effective address in addr, operand length)
+_MODE_SRC = {
+    'ZP':   ("addr = ram[pc]", 1),
+    'ZPX':  ("addr = (ram[pc] + self.X) & 0xFF", 1),
+    'ZPY':  ("addr = (ram[pc] + self.Y) & 0xFF", 1),
+    'ABS':  (_OPERAND_WORD_SRC, 2),
+    'ABSX': (_OPERAND_WORD_SRC + "\naddr = (addr + self.X) & 0xFFFF", 2),
+    'ABSY': (_OPERAND_WORD_SRC + "\naddr = (addr + self.Y) & 0xFFFF", 2),
+    'INDX': ("zp = (ram[pc] + self.X) & 0xFF\n" + _read_src("lo", "zp") + "\nzp = (zp + 1) & 0xFF\n"
+             + _read_src("hi", "zp") + "\naddr = (hi << 8) | lo", 1),
+    'INDY': ("zp = ram[pc]\n" + _read_src("lo", "zp") + "\nzp = (zp + 1) & 0xFF\n"
+             + _read_src("hi", "zp") + "\naddr = (((hi << 8) | lo) + self.Y) & 0xFFFF", 1),
+}
+
+_ADC_SRC = """i = ((self.A << 9) | (value << 1) | (self._p & C)) << 1
+self._p = (self._p & _VC_MASK) | _ADC[i + 1]
+self.A = self._nz = _ADC[i]"""
+
+# mnemonic -> (operand use, body). 'r' bodies get the operand in value, 'w' bodies only get
+# addr, 'm' bodies get value and store it back where the body says "write".
+_OP_SRC = {
+    'LDA': ('r', "self.A = self._nz = value"),
+    'LDX': ('r', "self.X = self._nz = value"),
+    'LDY': ('r', "self.Y = self._nz = value"),
+    'STA': ('w', "value = self.A\nwrite"),
+    'STX': ('w', "value = self.X\nwrite"),
+    'STY': ('w', "value = self.Y\nwrite"),
+    'ADC': ('r', _ADC_SRC),
+    'SBC': ('r', "value ^= 0xFF\n" + _ADC_SRC),
+    'AND': ('r', "self.A = self._nz = self.A & value"),
+    'ORA': ('r', "self.A = self._nz = self.A | value"),
+    'EOR': ('r', "self.A = self._nz = self.A ^ value"),
+    'CMP': ('r', "self._p = (self._p & _C_MASK) | (C if self.A >= value else 0)\nself._nz = (self.A - value) & 0xFF"),
+    'CPX': ('r', "self._p = (self._p & _C_MASK) | (C if self.X >= value else 0)\nself._nz = (self.X - value) & 0xFF"),
+    'CPY': ('r', "self._p = (self._p & _C_MASK) | (C if self.Y >= value else 0)\nself._nz = (self.Y - value) & 0xFF"),
+    'BIT': ('r', "self._p = (self._p & _V_MASK) | (value & V)\nself._nz = (self.A & value) | ((value & N) << 8)"),
+    'INC': ('m', "value = (value + 1) & 0xFF\nwrite\nself._nz = value"),
+    'DEC': ('m', "value = (value - 1) & 0xFF\nwrite\nself._nz = value"),
+    'ASL': ('m', "self._p = (self._p & _C_MASK) | (value >> 7)\nvalue = (value << 1) & 0xFF\nwrite\nself._nz = value"),
+    'LSR': ('m', "self._p = (self._p & _C_MASK) | (value & C)\nvalue >>= 1\nwrite\nself._nz = value"),
+    'ROL': ('m', "value = (value << 1) | (self._p & C)\nself._p = (self._p & _C_MASK) | (value >> 8)\nvalue &= 0xFF\nwrite\nself._nz = value"),
+    'ROR': ('m', "value |= (self._p & C) << 8\nself._p = (self._p & _C_MASK) | (value & C)\nvalue >>= 1\nwrite\nself._nz = value"),
+    'JMP': ('w', "self.PC = addr"),
+    'JSR': ('w', "ret = (pc + 1) & 0xFFFF  # address of the last operand byte\n"
+                   "sp = self.SP\n"
+                   "if sp:\n"
+                   "    _PUT_WORD(ram, 0xFF + sp, ret)\n"
+                   "    self.SP = (sp - 2) & 0xFF\n"
+                   "else:\n"
+                   "    self.push_word(ret)\n"
+                   "self.PC = addr"),
+}
+
+def _fused_source(op, mode):
+    """python source for the fused handler of one mnemonic/addressing mode pair."""
+    use, body = _OP_SRC[op]
+    lines = ["ram = self._ram", "pc = self.PC"]
+    if mode == 'IMM':
+        lines.append("value = ram[pc]")
+        size = 1
+    else:
+        decode, size = _MODE_SRC[mode]
+        lines += decode.split("\n")
+        if use != 'w':
+            lines.append(_read_src("value", "addr"))
+    lines.append(f"self.PC = pc + {size}")
+    for line in body.split("\n"):
+        lines += _write_src(mode).split("\n") if line == "write" else [line]
+    name = f"_{op.lower()}_{mode.lower()}"
+    return name, f"def {name}(self):\n" + "".join(f"    {line}\n" for line in lines)
+
+def _build_fused_handlers():
+    """compile a handler for every OPCODES entry we have snippets for; returns {opcode: function}."""
+    namespace = {'C': C, 'V': V, 'N': N, '_C_MASK': _C_MASK, '_V_MASK': _V_MASK, '_VC_MASK': _VC_MASK, '_ADC': _ADC, '_WORD': _WORD, '_PUT_WORD': _PUT_WORD}
+    handlers = {}
+    for key, opcode in OPCODES.items():
+        op, _, mode = key.partition('_')
+        if op not in _OP_SRC or (mode != 'IMM' and mode not in _MODE_SRC):
+            continue
+        name, src = _fused_source(op, mode)
+        exec(compile(src, f"<cpu {name}>", "exec"), namespace)
+        handlers[opcode] = namespace[name]
+    return handlers
+
+
 class CPU:
+    # fixed attribute layout: registers live in slots on the instance instead of a __dict__
+    __slots__ = ('A', 'X', 'Y', 'SP', 'PC', '_p', '_nz', 'cycles',
+                 'memory', '_ram', '_read_handlers', '_write_handlers', 'opcode_table',
+                 'halted')
+
     def __init__(self, memory):
         """initialize the CPU with a memory object and reset."""
         self.memory = memory              # expects a Memory obj
@@ -23,9 +169,16 @@ class CPU:
         self.X = 0                        # x register
         self.Y = 0                        # y register
         self.SP = 0xFD                    # stack pointer
+
+        # cache the backing RAM and handler maps so reads and writes skip Memory's method calls
+        self._ram = self.memory.raw
+        self._read_handlers = self.memory.read_handlers
+        self._write_handlers = self.memory.write_handlers
+
         self.PC = self.read_word(0xFFFC)  # reset vector
-        self.P = 0x24                     # processor status: NV-BDIZC
+        self.P = 0x24                     # processor status: NV-BDIZC (sets _p and _nz)
         self.cycles = 0                   # cycle count
+        self.halted = False               # set once a BRK executes
 
         # initialize opcode dispatch table
         self._init_opcodes()
@@ -34,200 +187,136 @@ class CPU:
     # --- memory helpers ---
     def read(self, addr):
         """read a byte from memory at the specified address."""
-        return self.memory.read(addr & 0xFFFF)
+        addr &= 0xFFFF
+        if addr in self._read_handlers:
+            return self._read_handlers[addr](addr)
+        return self._ram[addr]
 
     def write(self, addr, value):
         """write a byte to memory at the specified address."""
-        self.memory.write(addr & 0xFFFF, value & 0xFF)
+        addr &= 0xFFFF
+        # plain RAM below the ROM banks is written directly, everything else goes through Memory
+        if addr < 0xA000 and addr not in self._write_handlers:
+            self._ram[addr] = value & 0xFF
+        else:
+            self.memory.write(addr, value & 0xFF)
 
     def read_word(self, addr):
-        """read a 16-bit word from memory at the specified address."""
-        lo = self.read(addr)
-        hi = self.read(addr + 1)
-        return (hi << 8) | lo
+        """read a 16-bit little-endian word straight from RAM at the specified address."""
+        addr &= 0xFFFF
+        if addr == 0xFFFF:
+            return self._ram[0xFFFF] | (self._ram[0] << 8)
+        return _WORD(self._ram, addr)[0]
     
     def read_immediate(self) -> int:
         """read an immediate value from the current program counter."""
-        value = self.memory[self.PC]
-        self.PC += 1
-        return value
+        pc = self.PC & 0xFFFF
+        self.PC = pc + 1
+        return self._ram[pc]
 
     def read_zero_page(self) -> int:
         """read a zero-page value from the current program counter."""
-        addr = self.memory[self.PC]
-        self.PC += 1
-        return self.memory[addr]
+        pc = self.PC & 0xFFFF
+        self.PC = pc + 1
+        return self.read(self._ram[pc])
     
 
     # --- stack helpers ---
+    # the stack page is plain RAM, so these store into it directly instead
+    # of going through read/write and the device handler lookups
     def push(self, value):
         """push a byte onto the stack."""
-        self.write(0x100 + self.SP, value)
-        self.SP = (self.SP - 1) & 0xFF
+        sp = self.SP
+        self._ram[0x100 + sp] = value & 0xFF
+        self.SP = (sp - 1) & 0xFF
 
     def pull(self):
         """pull a byte from the stack."""
-        self.SP = (self.SP + 1) & 0xFF
-        return self.read(0x100 + self.SP)
+        self.SP = sp = (self.SP + 1) & 0xFF
+        return self._ram[0x100 + sp]
+
+    def push_word(self, value):
+        """push a 16-bit word onto the stack, high byte first."""
+        sp = self.SP
+        if sp:
+            _PUT_WORD(self._ram, 0xFF + sp, value & 0xFFFF)
+            self.SP = (sp - 2) & 0xFF
+        else:  # the word straddles the stack wrap
+            self.push(value >> 8)
+            self.push(value)
+
+    def pull_word(self):
+        """pull a 16-bit word from the stack, low byte first."""
+        sp = self.SP
+        if sp < 0xFE:
+            self.SP = sp + 2
+            return _WORD(self._ram, 0x101 + sp)[0]
+        lo = self.pull()
+        return lo | (self.pull() << 8)
     
 
     # --- status flags ---
+    # N and Z are evaluated lazily: instead of rebuilding P after every
+    # instruction, the last result byte is kept in _nz and P is only put
+    # back together when something reads it (php, brk, the P property).
+    # Z is set when the low byte of _nz is zero, N when bit 7 or bit 15 is
+    # set; bit 15 lets bit/plp/rti express N and Z together. the remaining
+    # flags live in _p as usual.
+    @property
+    def P(self):
+        """processor status with N and Z rebuilt from the last result."""
+        nz = self._nz
+        return (self._p & _ZN_MASK) | _ZN[nz & 0xFF] | ((nz >> 8) & N)
+
+    @P.setter
+    def P(self, value):
+        """set processor status, splitting N and Z back out into _nz."""
+        self._p = value
+        self._nz = (0 if value & Z else 1) | ((value & N) << 8)
+
     def set_flag(self, flag, cond):
         """set or clear a status flag based on a condition."""
-        if cond:
-            self.P |= flag
-        else:
-            self.P &= ~flag
+        flag = int(flag)  # keep P a plain int even when handed a Flag
+        self.P = (self.P & ~flag) | (flag if cond else 0)
 
     def get_flag(self, flag):
         """check if a status flag is set."""
-        return (self.P & flag) != 0
+        return self.P & int(flag) != 0
     
 
     # --- addressing modes ---
-    def immediate(self):
-        """read an immediate value from the current program counter."""
-        value = self.read(self.PC)
-        self.PC += 1
-        return value
-
-    def zero_page(self):
-        """read a zero-page address from the current program counter."""
-        addr = self.read(self.PC)
-        self.PC += 1
-        return addr
-
-    def zero_page_x(self):
-        """read a zero-page address with X offset from the current program counter."""
-        addr = (self.read(self.PC) + self.X) & 0xFF
-        self.PC += 1
-        return addr
-
-    def zero_page_y(self):
-        """read a zero-page address with Y offset from the current program counter."""
-        addr = (self.read(self.PC) + self.Y) & 0xFF
-        self.PC += 1
-        return addr
-
-    def absolute(self):
-        """read an absolute address from the current program counter."""
-        addr = self.read_word(self.PC)
-        self.PC += 2
-        return addr
-
-    def absolute_x(self):
-        """read an absolute address with X offset from the current program counter."""
-        base = self.read_word(self.PC)
-        self.PC += 2
-        return (base + self.X) & 0xFFFF
-
-    def absolute_y(self):
-        """read an absolute address with Y offset from the current program counter."""
-        base = self.read_word(self.PC)
-        self.PC += 2
-        return (base + self.Y) & 0xFFFF
-
     def indirect(self):
         """read an indirect address from the current program counter."""
-        ptr = self.read_word(self.PC)
-        self.PC += 2
-        # emulated 6502 bug: indirect JMP wraps page
-        if (ptr & 0xFF) == 0xFF:
-            lo = self.read(ptr)
-            hi = self.read(ptr & 0xFF00)
-        else:
-            lo = self.read(ptr)
-            hi = self.read(ptr + 1)
-        return (hi << 8) | lo
-
-    def indexed_indirect(self):
-        """read an indexed indirect address from the current program counter."""
-        zp = (self.read(self.PC) + self.X) & 0xFF
-        self.PC += 1
-        lo = self.read(zp)
-        hi = self.read((zp + 1) & 0xFF)
+        pc = self.PC
+        ptr = self.read_word(pc)
+        self.PC = pc + 2
+        # emulated 6502 bug: the high byte comes from the same page, so the
+        # +1 wraps within it instead of carrying into the page number
+        lo = self.read(ptr)
+        hi = self.read((ptr & 0xFF00) | ((ptr + 1) & 0xFF))
         return (hi << 8) | lo
 
-    def indirect_indexed(self):
-        """read an indirect indexed address from the current program counter."""
-        zp = self.read(self.PC)
-        self.PC += 1
-        lo = self.read(zp)
-        hi = self.read((zp + 1) & 0xFF)
-        return ((hi << 8) | lo) + self.Y
-
-    def relative(self):
-        """read a relative address from the current program counter."""
-        offset = self.read(self.PC)
-        self.PC += 1
-        if offset < 0x80:
-            return self.PC + offset
-        else:
-            return self.PC + offset - 0x100
-        
 
     # --- instruction implementations ---
-    def lda(self, value):
-        """load accumulator with a value."""
-        self.A = value & 0xFF
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
-
-    def ldx(self, value):
-        """load x register with a value."""
-        self.X = value & 0xFF
-        self.set_flag(Flag.Z, self.X == 0)
-        self.set_flag(Flag.N, self.X & 0x80)
-
-    def ldy(self, value):
-        """load y register with a value."""
-        self.Y = value & 0xFF
-        self.set_flag(Flag.Z, self.Y == 0)
-        self.set_flag(Flag.N, self.Y & 0x80)
-
-
-    def sta(self, addr):
-        """store accumulator to memory."""
-        self.write(addr, self.A)
-
-    def stx(self, addr):
-        """store x register to memory."""
-        self.write(addr, self.X)
-
-    def sty(self, addr):
-        """store y register to memory."""
-        self.write(addr, self.Y)
-
-
     def tax(self):
         """transfer accumulator to x register."""
-        self.X = self.A
-        self.set_flag(Flag.Z, self.X == 0)
-        self.set_flag(Flag.N, self.X & 0x80)
+        self.X = self._nz = self.A
 
     def tay(self):
         """transfer accumulator to y register."""
-        self.Y = self.A
-        self.set_flag(Flag.Z, self.Y == 0)
-        self.set_flag(Flag.N, self.Y & 0x80)
+        self.Y = self._nz = self.A
 
     def txa(self):
         """transfer x register to accumulator."""
-        self.A = self.X
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
+        self.A = self._nz = self.X
 
     def tya(self):
         """transfer y register to accumulator."""
-        self.A = self.Y
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
+        self.A = self._nz = self.Y
 
     def tsx(self):
         """transfer stack pointer to x register."""
-        self.X = self.SP
-        self.set_flag(Flag.Z, self.X == 0)
-        self.set_flag(Flag.N, self.X & 0x80)
+        self.X = self._nz = self.SP
 
     def txs(self):
         """transfer x register to stack pointer."""
@@ -236,281 +325,221 @@ class CPU:
 
     def pha(self):
         """push accumulator onto the stack."""
-        self.push(self.A)
+        sp = self.SP
+        self._ram[0x100 + sp] = self.A
+        self.SP = (sp - 1) & 0xFF
 
     def php(self):
         """push processor status onto the stack."""
-        self.push(self.P | Flag.B | Flag.U)
+        sp = self.SP
+        self._ram[0x100 + sp] = self.P | B | U
+        self.SP = (sp - 1) & 0xFF
 
     def pla(self):
         """pull accumulator from the stack."""
-        self.A = self.pull()
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
+        self.SP = sp = (self.SP + 1) & 0xFF
+        self.A = self._nz = self._ram[0x100 + sp]
 
     def plp(self):
         """pull processor status from the stack."""
-        self.P = (self.pull() & ~Flag.B) | Flag.U
-
-
-    def adc(self, value):
-        """add with carry to accumulator."""
-        carry = 1 if self.get_flag(Flag.C) else 0
-        result = self.A + value + carry
-        self.set_flag(Flag.C, result > 0xFF)
-        self.set_flag(Flag.Z, (result & 0xFF) == 0)
-        self.set_flag(Flag.N, result & 0x80)
-        self.set_flag(Flag.V, (~(self.A ^ value) & (self.A ^ result)) & 0x80)
-        self.A = result & 0xFF
-
-    def sbc(self, value):
-        """subtract with carry from accumulator."""
-        carry = 1 if self.get_flag(Flag.C) else 0
-        value ^= 0xFF
-        result = self.A + value + carry
-        self.set_flag(Flag.C, result > 0xFF)
-        self.set_flag(Flag.Z, (result & 0xFF) == 0)
-        self.set_flag(Flag.N, result & 0x80)
-        self.set_flag(Flag.V, (~(self.A ^ value) & (self.A ^ result)) & 0x80)
-        self.A = result & 0xFF
-
-
-    def and_(self, value):
-        """logical and with accumulator."""
-        self.A &= value
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
-
-    def ora(self, value):
-        """logical or with accumulator."""
-        self.A |= value
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
-
-    def eor(self, value):
-        """exclusive or with accumulator."""
-        self.A ^= value
-        self.set_flag(Flag.Z, self.A == 0)
-        self.set_flag(Flag.N, self.A & 0x80)
-
-
-    def cmp(self, value):
-        """compare accumulator with a value."""
-        temp = self.A - value
-        self.set_flag(Flag.C, self.A >= value)
-        self.set_flag(Flag.Z, (temp & 0xFF) == 0)
-        self.set_flag(Flag.N, temp & 0x80)
-
-    def cpx(self, value):
-        """compare x register with a value."""
-        temp = self.X - value
-        self.set_flag(Flag.C, self.X >= value)
-        self.set_flag(Flag.Z, (temp & 0xFF) == 0)
-        self.set_flag(Flag.N, temp & 0x80)
-
-    def cpy(self, value):
-        """compare y register with a value."""
-        temp = self.Y - value
-        self.set_flag(Flag.C, self.Y >= value)
-        self.set_flag(Flag.Z, (temp & 0xFF) == 0)
-        self.set_flag(Flag.N, temp & 0x80)
-
-
-    def inc(self, addr):
-        """increment a value in memory or a register."""
-        value = (self.read(addr) + 1) & 0xFF
-        self.write(addr, value)
-        self.set_flag(Flag.Z, value == 0)
-        self.set_flag(Flag.N, value & 0x80)
+        self.SP = sp = (self.SP + 1) & 0xFF
+        self.P = (self._ram[0x100 + sp] & ~B) | U
+
 
     def inx(self):
         """increment x register."""
-        self.X = (self.X + 1) & 0xFF
-        self.set_flag(Flag.Z, self.X == 0)
-        self.set_flag(Flag.N, self.X & 0x80)
+        self.X = self._nz = (self.X + 1) & 0xFF
 
     def iny(self):
         """increment y register."""
-        self.Y = (self.Y + 1) & 0xFF
-        self.set_flag(Flag.Z, self.Y == 0)
-        self.set_flag(Flag.N, self.Y & 0x80)
+        self.Y = self._nz = (self.Y + 1) & 0xFF
 
 
-    def dec(self, addr):
-        """decrement a value in memory or a register."""
-        value = (self.read(addr) - 1) & 0xFF
-        self.write(addr, value)
-        self.set_flag(Flag.Z, value == 0)
-        self.set_flag(Flag.N, value & 0x80)
-
     def dex(self):
         """decrement x register."""
-        self.X = (self.X - 1) & 0xFF
-        self.set_flag(Flag.Z, self.X == 0)
-        self.set_flag(Flag.N, self.X & 0x80)
+        self.X = self._nz = (self.X - 1) & 0xFF
 
     def dey(self):
         """decrement y register."""
-        self.Y = (self.Y - 1) & 0xFF
-        self.set_flag(Flag.Z, self.Y == 0)
-        self.set_flag(Flag.N, self.Y & 0x80)
-
-
-    def asl(self, addr=None):
-        """arithmetic shift left: shifts bits left, setting C flag to bit 7."""
-        if addr is None:
-            value = self.A
-            self.set_flag(Flag.C, value & 0x80)
-            value = (value << 1) & 0xFF
-            self.A = value
-        else:
-            value = self.read(addr)
-            self.set_flag(Flag.C, value & 0x80)
-            value = (value << 1) & 0xFF
-            self.write(addr, value)
-        self.set_flag(Flag.Z, value == 0)
-        self.set_flag(Flag.N, value & 0x80)
-
-    def lsr(self, addr=None):
-        """logical shift right: shifts bits right, setting c flag to bit 0."""
-        if addr is None:
-            value = self.A
-            self.set_flag(Flag.C, value & 0x01)
-            value = (value >> 1) & 0xFF
-            self.A = value
-        else:
-            value = self.read(addr)
-            self.set_flag(Flag.C, value & 0x01)
-            value = (value >> 1) & 0xFF
-            self.write(addr, value)
-        self.set_flag(Flag.Z, value == 0)
-        self.set_flag(Flag.N, value & 0x80)
-
-
-    def rol(self, addr=None):
-        """rotate left: shifts bits left, setting c flag to bit 7 and moving c to bit 0."""
-        carry_in = 1 if self.get_flag(Flag.C) else 0
-        if addr is None:
-            value = self.A
-            carry_out = value & 0x80
-            value = ((value << 1) | carry_in) & 0xFF
-            self.A = value
-        else:
-            value = self.read(addr)
-            carry_out = value & 0x80
-            value = ((value << 1) | carry_in) & 0xFF
-            self.write(addr, value)
-        self.set_flag(Flag.C, carry_out)
-        self.set_flag(Flag.Z, value == 0)
-        self.set_flag(Flag.N, value & 0x80)
-
-    def ror(self, addr=None):
-        """rotate right: shifts bits right, setting c flag to bit 0 and moving c to bit 7."""
-        carry_in = 1 if self.get_flag(Flag.C) else 0
-        if addr is None:
-            value = self.A
-            carry_out = value & 0x01
-            value = ((carry_in << 7) | (value >> 1)) & 0xFF
-            self.A = value
-        else:
-            value = self.read(addr)
-            carry_out = value & 0x01
-            value = ((carry_in << 7) | (value >> 1)) & 0xFF
-            self.write(addr, value)
-        self.set_flag(Flag.C, carry_out)
-        self.set_flag(Flag.Z, value == 0)
-        self.set_flag(Flag.N, value & 0x80)
+        self.Y = self._nz = (self.Y - 1) & 0xFF
 
 
-    def bit(self, value):
-        """bit test: sets flags based on the value ANDed with accumulator."""
-        self.set_flag(Flag.Z, (self.A & value) == 0)
-        self.set_flag(Flag.N, value & 0x80)
-        self.set_flag(Flag.V, value & 0x40)
+    # accumulator forms only; the memory forms are the generated handlers in _FUSED
+    def asl_a(self):
+        """arithmetic shift left of the accumulator, setting C flag to bit 7."""
+        value = self.A
+        self._p = (self._p & _C_MASK) | (value >> 7)
+        self.A = self._nz = (value << 1) & 0xFF
 
+    def lsr_a(self):
+        """logical shift right of the accumulator, setting c flag to bit 0."""
+        value = self.A
+        self._p = (self._p & _C_MASK) | (value & C)
+        self.A = self._nz = value >> 1
 
-    def jmp(self, addr):
-        """jump to an absolute address."""
-        self.PC = addr
 
-    def jsr(self, addr):
-        """jump to subroutine: pushes return address onto stack and jumps to addr."""
-        self.push((self.PC - 1) >> 8)
-        self.push((self.PC - 1) & 0xFF)
-        self.PC = addr
+    def rol_a(self):
+        """rotate the accumulator left, setting c flag to bit 7 and moving c to bit 0."""
+        value = self.A
+        p = self._p
+        self._p = (p & _C_MASK) | (value >> 7)
+        self.A = self._nz = ((value << 1) | (p & C)) & 0xFF
+
+    def ror_a(self):
+        """rotate the accumulator right, setting c flag to bit 0 and moving c to bit 7."""
+        value = self.A
+        p = self._p
+        self._p = (p & _C_MASK) | (value & C)
+        self.A = self._nz = ((p & C) << 7) | (value >> 1)
 
 
     def rts(self):
         """return from subroutine: pulls return address from stack and continues execution."""
-        lo = self.pull()
-        hi = self.pull()
-        self.PC = ((hi << 8) | lo) + 1
+        sp = self.SP
+        if sp < 0xFE:
+            self.SP = sp + 2
+            self.PC = _WORD(self._ram, 0x101 + sp)[0] + 1
+        else:
+            self.PC = self.pull_word() + 1
 
     def rti(self):
         """return from interrupt: pulls processor status and program counter from stack."""
-        self.P = (self.pull() & ~Flag.B) | Flag.U
-        lo = self.pull()
-        hi = self.pull()
-        self.PC = (hi << 8) | lo
+        self.P = (self.pull() & ~B) | U
+        self.PC = self.pull_word()
 
 
     def clc(self):
         """clear carry flag."""
-        self.set_flag(Flag.C, False)
+        self._p &= _C_MASK
 
     def sec(self):
         """set carry flag."""
-        self.set_flag(Flag.C, True)
+        self._p |= C
 
     def cli(self):
         """clear interrupt disable flag."""
-        self.set_flag(Flag.I, False)
+        self._p &= ~I
 
     def sei(self):
         """set interrupt disable flag."""
-        self.set_flag(Flag.I, True)
+        self._p |= I
 
     def clv(self):
         """clear overflow flag."""
-        self.set_flag(Flag.V, False)
+        self._p &= _V_MASK
 
     def cld(self):
         """clear decimal mode flag."""
-        self.set_flag(Flag.D, False)
+        self._p &= ~D
 
     def sed(self):
         """set decimal mode flag."""
-        self.set_flag(Flag.D, True)
+        self._p |= D
 
 
     def brk(self):
         """break: pushes program counter and processor status onto stack, sets interrupt disable flag, and jumps to interrupt vector."""
         self.PC += 1
-        self.push(self.PC >> 8)
-        self.push(self.PC & 0xFF)
+        self.push_word(self.PC)
         self.php()
-        self.set_flag(Flag.I, True)
+        self._p |= I
         self.PC = self.read_word(0xFFFE)
+        self.halted = True
 
     def nop(self):
         """no operation: does nothing."""
         pass
 
 
-    # --- branches ---
-    def branch(self, cond):
-        """branch to a relative address if the condition is met."""
-        addr = self.relative()
-        if cond:
-            self.PC = addr
-            
+    # --- opcode handlers ---
+    # operand-taking opcodes use the generated handlers in _FUSED; the ones
+    # here need something the snippets don't cover.
+    def _jmp_ind(self):
+        """JMP (indirect)."""
+        self.PC = self.indirect()
+
+
+    # branches: BCC, BCS, BEQ, BMI, BNE, BPL, BVC, BVS
+    # each tests its flag bit directly; the offset byte is only read when taken
+    def _bcc(self):
+        """BCC: branch if carry clear."""
+        pc = self.PC
+        if not self._p & C:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _bcs(self):
+        """BCS: branch if carry set."""
+        pc = self.PC
+        if self._p & C:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _beq(self):
+        """BEQ: branch if equal (zero flag set)."""
+        pc = self.PC
+        if not self._nz & 0xFF:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _bmi(self):
+        """BMI: branch if minus (negative flag set)."""
+        pc = self.PC
+        if self._nz & 0x8080:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _bne(self):
+        """BNE: branch if not equal (zero flag clear)."""
+        pc = self.PC
+        if self._nz & 0xFF:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _bpl(self):
+        """BPL: branch if plus (negative flag clear)."""
+        pc = self.PC
+        if not self._nz & 0x8080:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _bvc(self):
+        """BVC: branch if overflow clear."""
+        pc = self.PC
+        if not self._p & V:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+    def _bvs(self):
+        """BVS: branch if overflow set."""
+        pc = self.PC
+        if self._p & V:
+            self.PC = (pc + 1 + _REL[self._ram[pc & 0xFFFF]]) & 0xFFFF
+        else:
+            self.PC = pc + 1
+
+
+    def _illegal(self):
+        """raise for an opcode with no handler."""
+        addr = (self.PC - 1) & 0xFFFF  # PC already wrapped past $FFFF for an opcode there
+        opcode = self.read(addr)
+        raise NotImplementedError(f"Warning: Unimplemented opcode 0x{opcode:02X} at address 0x{addr:04X}")
+
 
     # --- opcode Table Initialization ---
     def _init_opcodes(self):
         """
         Initializes opcode dispatch table for the CPU.
-        The opcode table maps each opcode (byte value) to the corresponding handler function/lambda,
-        implementing the instruction's behavior for the following instruction groups:
+        The opcode table is a 256-entry list indexed by opcode byte. Each slot holds a bound method
+        (a fused fetch+op handler when the instruction takes an operand), unused slots hold _illegal,
+        and the handlers implement the instruction's behavior for the following instruction groups:
 
         # Load/Store Operations:
             - LDA, LDX, LDY: Load accumulator/X/Y register from memory (various addressing modes)
@@ -556,51 +585,12 @@ class CPU:
         # Branch Operations:
             - BCC, BCS, BEQ, BMI, BNE, BPL, BVC, BVS: Conditional branches based on processor flags
         """
-        # initialize opcode table
-        self.opcode_table = {}
-
-        # load accumulator: lda
-        self.opcode_table[0xA9] = lambda: self.lda(self.immediate())
-        self.opcode_table[0xA5] = lambda: self.lda(self.read(self.zero_page()))
-        self.opcode_table[0xB5] = lambda: self.lda(self.read(self.zero_page_x()))
-        self.opcode_table[0xAD] = lambda: self.lda(self.read(self.absolute()))
-        self.opcode_table[0xBD] = lambda: self.lda(self.read(self.absolute_x()))
-        self.opcode_table[0xB9] = lambda: self.lda(self.read(self.absolute_y()))
-        self.opcode_table[0xA1] = lambda: self.lda(self.read(self.indexed_indirect()))
-        self.opcode_table[0xB1] = lambda: self.lda(self.read(self.indirect_indexed()))
-
-        # load x register: ldx
-        self.opcode_table[0xA2] = lambda: self.ldx(self.immediate())
-        self.opcode_table[0xA6] = lambda: self.ldx(self.read(self.zero_page()))
-        self.opcode_table[0xB6] = lambda: self.ldx(self.read(self.zero_page_y()))
-        self.opcode_table[0xAE] = lambda: self.ldx(self.read(self.absolute()))
-        self.opcode_table[0xBE] = lambda: self.ldx(self.read(self.absolute_y()))
-
-        # load y register: ldy
-        self.opcode_table[0xA0] = lambda: self.ldy(self.immediate())
-        self.opcode_table[0xA4] = lambda: self.ldy(self.read(self.zero_page()))
-        self.opcode_table[0xB4] = lambda: self.ldy(self.read(self.zero_page_x()))
-        self.opcode_table[0xAC] = lambda: self.ldy(self.read(self.absolute()))
-        self.opcode_table[0xBC] = lambda: self.ldy(self.read(self.absolute_x()))
-
-        # store accumulator: sta
-        self.opcode_table[0x85] = lambda: self.sta(self.zero_page())
-        self.opcode_table[0x95] = lambda: self.sta(self.zero_page_x())
-        self.opcode_table[0x8D] = lambda: self.sta(self.absolute())
-        self.opcode_table[0x9D] = lambda: self.sta(self.absolute_x())
-        self.opcode_table[0x99] = lambda: self.sta(self.absolute_y())
-        self.opcode_table[0x81] = lambda: self.sta(self.indexed_indirect())
-        self.opcode_table[0x91] = lambda: self.sta(self.indirect_indexed())
-
-        # store x register: stx
-        self.opcode_table[0x86] = lambda: self.stx(self.zero_page())
-        self.opcode_table[0x96] = lambda: self.stx(self.zero_page_y())
-        self.opcode_table[0x8E] = lambda: self.stx(self.absolute())
-
-        # store y register: sty
-        self.opcode_table[0x84] = lambda: self.sty(self.zero_page())
-        self.opcode_table[0x94] = lambda: self.sty(self.zero_page_x())
-        self.opcode_table[0x8C] = lambda: self.sty(self.absolute())
+        # initialize opcode table: every slot starts out illegal
+        self.opcode_table = [self._illegal] * 256
+
+        # operand-taking instructions: generated fused handlers
+        for opcode, handler in _FUSED.items():
+            self.opcode_table[opcode] = handler.__get__(self)
 
         # transfers: TAX, TAY, TXA, TYA, TSX, TXS
         self.opcode_table[0xAA] = self.tax
@@ -609,142 +599,31 @@ class CPU:
         self.opcode_table[0x98] = self.tya
         self.opcode_table[0xBA] = self.tsx
         self.opcode_table[0x9A] = self.txs
-        
+
         # push/pull accumulator and status: PHA, PHP, PLA, PLP
         self.opcode_table[0x48] = self.pha
         self.opcode_table[0x08] = self.php
         self.opcode_table[0x68] = self.pla
         self.opcode_table[0x28] = self.plp
 
-        # add with carry: ADC
-        self.opcode_table[0x69] = lambda: self.adc(self.immediate())
-        self.opcode_table[0x65] = lambda: self.adc(self.read(self.zero_page()))
-        self.opcode_table[0x75] = lambda: self.adc(self.read(self.zero_page_x()))
-        self.opcode_table[0x6D] = lambda: self.adc(self.read(self.absolute()))
-        self.opcode_table[0x7D] = lambda: self.adc(self.read(self.absolute_x()))
-        self.opcode_table[0x79] = lambda: self.adc(self.read(self.absolute_y()))
-        self.opcode_table[0x61] = lambda: self.adc(self.read(self.indexed_indirect()))
-        self.opcode_table[0x71] = lambda: self.adc(self.read(self.indirect_indexed()))
-
-        # subtract with carry: SBC
-        self.opcode_table[0xE9] = lambda: self.sbc(self.immediate())
-        self.opcode_table[0xE5] = lambda: self.sbc(self.read(self.zero_page()))
-        self.opcode_table[0xF5] = lambda: self.sbc(self.read(self.zero_page_x()))
-        self.opcode_table[0xED] = lambda: self.sbc(self.read(self.absolute()))
-        self.opcode_table[0xFD] = lambda: self.sbc(self.read(self.absolute_x()))
-        self.opcode_table[0xF9] = lambda: self.sbc(self.read(self.absolute_y()))
-        self.opcode_table[0xE1] = lambda: self.sbc(self.read(self.indexed_indirect()))
-        self.opcode_table[0xF1] = lambda: self.sbc(self.read(self.indirect_indexed()))
-
-        # logical AND with accumulator: AND
-        self.opcode_table[0x29] = lambda: self.and_(self.immediate())
-        self.opcode_table[0x25] = lambda: self.and_(self.read(self.zero_page()))
-        self.opcode_table[0x35] = lambda: self.and_(self.read(self.zero_page_x()))
-        self.opcode_table[0x2D] = lambda: self.and_(self.read(self.absolute()))
-        self.opcode_table[0x3D] = lambda: self.and_(self.read(self.absolute_x()))
-        self.opcode_table[0x39] = lambda: self.and_(self.read(self.absolute_y()))
-        self.opcode_table[0x21] = lambda: self.and_(self.read(self.indexed_indirect()))
-        self.opcode_table[0x31] = lambda: self.and_(self.read(self.indirect_indexed()))
-
-        # Logical OR with accumulator: ORA
-        self.opcode_table[0x09] = lambda: self.ora(self.immediate())
-        self.opcode_table[0x05] = lambda: self.ora(self.read(self.zero_page()))
-        self.opcode_table[0x15] = lambda: self.ora(self.read(self.zero_page_x()))
-        self.opcode_table[0x0D] = lambda: self.ora(self.read(self.absolute()))
-        self.opcode_table[0x1D] = lambda: self.ora(self.read(self.absolute_x()))
-        self.opcode_table[0x19] = lambda: self.ora(self.read(self.absolute_y()))
-        self.opcode_table[0x01] = lambda: self.ora(self.read(self.indexed_indirect()))
-        self.opcode_table[0x11] = lambda: self.ora(self.read(self.indirect_indexed()))
-        
-        # exclusive OR with accumulator: EOR
-        self.opcode_table[0x49] = lambda: self.eor(self.immediate())
-        self.opcode_table[0x45] = lambda: self.eor(self.read(self.zero_page()))
-        self.opcode_table[0x55] = lambda: self.eor(self.read(self.zero_page_x()))
-        self.opcode_table[0x4D] = lambda: self.eor(self.read(self.absolute()))
-        self.opcode_table[0x5D] = lambda: self.eor(self.read(self.absolute_x()))
-        self.opcode_table[0x59] = lambda: self.eor(self.read(self.absolute_y()))
-        self.opcode_table[0x41] = lambda: self.eor(self.read(self.indexed_indirect()))
-        self.opcode_table[0x51] = lambda: self.eor(self.read(self.indirect_indexed()))
-
-        # compare accumulator: CMP
-        self.opcode_table[0xC9] = lambda: self.cmp(self.immediate())
-        self.opcode_table[0xC5] = lambda: self.cmp(self.read(self.zero_page()))
-        self.opcode_table[0xD5] = lambda: self.cmp(self.read(self.zero_page_x()))
-        self.opcode_table[0xCD] = lambda: self.cmp(self.read(self.absolute()))
-        self.opcode_table[0xDD] = lambda: self.cmp(self.read(self.absolute_x()))
-        self.opcode_table[0xD9] = lambda: self.cmp(self.read(self.absolute_y()))
-        self.opcode_table[0xC1] = lambda: self.cmp(self.read(self.indexed_indirect()))
-        self.opcode_table[0xD1] = lambda: self.cmp(self.read(self.indirect_indexed()))
-
-        # compare X register: CPX
-        self.opcode_table[0xE0] = lambda: self.cpx(self.immediate())
-        self.opcode_table[0xE4] = lambda: self.cpx(self.read(self.zero_page()))
-        self.opcode_table[0xEC] = lambda: self.cpx(self.read(self.absolute()))
-
-        # compare Y register: CPY
-        self.opcode_table[0xC0] = lambda: self.cpy(self.immediate())
-        self.opcode_table[0xC4] = lambda: self.cpy(self.read(self.zero_page()))
-        self.opcode_table[0xCC] = lambda: self.cpy(self.read(self.absolute()))
-
-        # increment memory: INC
-        self.opcode_table[0xE6] = lambda: self.inc(self.zero_page())
-        self.opcode_table[0xF6] = lambda: self.inc(self.zero_page_x())
-        self.opcode_table[0xEE] = lambda: self.inc(self.absolute())
-        self.opcode_table[0xFE] = lambda: self.inc(self.absolute_x())
-
         # increment X or Y register: INX, INY
         self.opcode_table[0xE8] = self.inx
         self.opcode_table[0xC8] = self.iny
 
-        # decrement memory: DEC
-        self.opcode_table[0xC6] = lambda: self.dec(self.zero_page())
-        self.opcode_table[0xD6] = lambda: self.dec(self.zero_page_x())
-        self.opcode_table[0xCE] = lambda: self.dec(self.absolute())
-        self.opcode_table[0xDE] = lambda: self.dec(self.absolute_x())
-
         # decrement X or Y register: DEX, DEY
         self.opcode_table[0xCA] = self.dex
         self.opcode_table[0x88] = self.dey
 
-        # arithmetic shift left: ASL
-        self.opcode_table[0x0A] = lambda: self.asl()
-        self.opcode_table[0x06] = lambda: self.asl(self.zero_page())
-        self.opcode_table[0x16] = lambda: self.asl(self.zero_page_x())
-        self.opcode_table[0x0E] = lambda: self.asl(self.absolute())
-        self.opcode_table[0x1E] = lambda: self.asl(self.absolute_x())
-
-        # logical shift right: LSR
-        self.opcode_table[0x4A] = lambda: self.lsr()
-        self.opcode_table[0x46] = lambda: self.lsr(self.zero_page())
-        self.opcode_table[0x56] = lambda: self.lsr(self.zero_page_x())
-        self.opcode_table[0x4E] = lambda: self.lsr(self.absolute())
-        self.opcode_table[0x5E] = lambda: self.lsr(self.absolute_x())
-
-        # rotate left: ROL
-        self.opcode_table[0x2A] = lambda: self.rol()
-        self.opcode_table[0x26] = lambda: self.rol(self.zero_page())
-        self.opcode_table[0x36] = lambda: self.rol(self.zero_page_x())
-        self.opcode_table[0x2E] = lambda: self.rol(self.absolute())
-        self.opcode_table[0x3E] = lambda: self.rol(self.absolute_x())
-
-        # rotate right: ROR
-        self.opcode_table[0x6A] = lambda: self.ror()
-        self.opcode_table[0x66] = lambda: self.ror(self.zero_page())
-        self.opcode_table[0x76] = lambda: self.ror(self.zero_page_x())
-        self.opcode_table[0x6E] = lambda: self.ror(self.absolute())
-        self.opcode_table[0x7E] = lambda: self.ror(self.absolute_x())
-
-        # bit test: BIT
-        self.opcode_table[0x89] = lambda: self.bit(self.immediate())
-        self.opcode_table[0x24] = lambda: self.bit(self.read(self.zero_page()))
-        self.opcode_table[0x2C] = lambda: self.bit(self.read(self.absolute()))
-
-        # jump to address: JMP
-        self.opcode_table[0x4C] = lambda: self.jmp(self.absolute())
-        self.opcode_table[0x6C] = lambda: self.jmp(self.indirect())
-
-        # jump to subroutine: JSR, return from Subroutine: RTS, return from Interrupt: RTI, break: BRK
-        self.opcode_table[0x20] = lambda: self.jsr(self.absolute())
+        # shifts/rotates on the accumulator: ASL A, LSR A, ROL A, ROR A
+        self.opcode_table[0x0A] = self.asl_a
+        self.opcode_table[0x4A] = self.lsr_a
+        self.opcode_table[0x2A] = self.rol_a
+        self.opcode_table[0x6A] = self.ror_a
+
+        # jump indirect: JMP (addr)
+        self.opcode_table[0x6C] = self._jmp_ind
+
+        # return from Subroutine: RTS, return from Interrupt: RTI, break: BRK
         self.opcode_table[0x60] = self.rts
         self.opcode_table[0x40] = self.rti
         self.opcode_table[0x00] = self.brk
@@ -762,30 +641,44 @@ class CPU:
         self.opcode_table[0xF8] = self.sed
 
         # branch instructions: BCC, BCS, BEQ, BMI, BNE, BPL, BVC, BVS
-        self.opcode_table[0x90] = lambda: self.branch(not self.get_flag(Flag.C))  # BCC: branch if carry clear
-        self.opcode_table[0xB0] = lambda: self.branch(self.get_flag(Flag.C))      # BCS: branch if carry set
-        self.opcode_table[0xF0] = lambda: self.branch(self.get_flag(Flag.Z))      # BEQ: branch if equal (zero flag set)
-        self.opcode_table[0x30] = lambda: self.branch(self.get_flag(Flag.N))      # BMI: branch if minus (negative flag set)
-        self.opcode_table[0xD0] = lambda: self.branch(not self.get_flag(Flag.Z))  # BNE: branch if not equal (zero flag clear)
-        self.opcode_table[0x10] = lambda: self.branch(not self.get_flag(Flag.N))  # BPL: branch if plus (negative flag clear)
-        self.opcode_table[0x50] = lambda: self.branch(not self.get_flag(Flag.V))  # BVC: branch if overflow clear
-        self.opcode_table[0x70] = lambda: self.branch(self.get_flag(Flag.V))      # BVS: branch if overflow set
+        self.opcode_table[0x90] = self._bcc
+        self.opcode_table[0xB0] = self._bcs
+        self.opcode_table[0xF0] = self._beq
+        self.opcode_table[0x30] = self._bmi
+        self.opcode_table[0xD0] = self._bne
+        self.opcode_table[0x10] = self._bpl
+        self.opcode_table[0x50] = self._bvc
+        self.opcode_table[0x70] = self._bvs
 
     # --- CPU step ---
     def step(self):
         """execute a single CPU instruction."""
-        opcode = self.read(self.PC)
-        self.PC += 1
-        handler = self.opcode_table[opcode]
-
-        if handler is not None:
-            handler()
-
-        else:
-            raise NotImplementedError(f"Warning: Unimplemented opcode 0x{opcode:02X} at address 0x{self.PC - 1:04X}")
+        # instruction bytes are fetched straight from RAM; PC is wrapped here so
+        # handlers can index the operand at self.PC without masking it
+        pc = self.PC & 0xFFFF
+        self.PC = (pc + 1) & 0xFFFF
+        self.opcode_table[self._ram[pc]]()
 
     # --- run for n instructions ---
     def run(self, n):
         """run the CPU for n instructions."""
-        for _ in range(n):
-            if self.read(self.PC) != 0x00: self.step()
\ No newline at end of file
+        self.run_n(n)
+
+    def run_n(self, budget):
+        """execute up to budget instructions, stopping once a BRK halts the CPU; returns how many ran."""
+        if self.halted:
+            return 0
+        # same fetch as step(), with the table and RAM hoisted into locals
+        ram = self._ram
+        table = self.opcode_table
+        for executed in range(budget):
+            pc = self.PC & 0xFFFF
+            self.PC = (pc + 1) & 0xFFFF
+            table[ram[pc]]()
+            if self.halted:
+                return executed + 1
+        return budget
+
+
+# fused handlers for every operand-taking opcode, built once at import
+_FUSED = _build_fused_handlers()
@@ -24,6 +24,11 @@ class Memory:
         # allocation pointer for auto-allocation of data (default starting at $B000) will be used in the future
         self.alloc_ptr = 0xB000
 
+    @property
+    def raw(self):
+        """the backing bytearray, for callers that index RAM directly."""
+        return self.data
+
     def read(self, addr):
         """read a byte from memory at the given address."""
         addr &= 0xFFFF
@@ -46,8 +51,11 @@ class Memory:
     # loads ROM data @ a given base address
     def load_rom(self, code, base):
         """load ROM data into memory at the specified base address."""
-        for i,b in enumerate(code):
-            self.data[base + i] = b
+        end = base + len(code)
+        # a slice past the end would grow the bytearray instead of failing
+        if end > self.size:
+            raise IndexError(f"ROM of {len(code)} bytes at ${base:04X} runs past the end of memory")
+        self.data[base:end] = bytes(code)
 
     # handler helpers (registration for read/write handlers)
     def register_read_handler(self, addr, handler):
@@ -67,12 +75,11 @@ class Memory:
         else:
             candidate = start
 
-        while candidate + length <= self.size:
-            if all(self.data[i] == 0 for i in range(candidate, candidate + length)):
-                self.alloc_ptr = candidate + length
-                return candidate
-            
-            candidate += 1
+        # first run of length zero bytes at or after candidate, found by bytearray.find in C
+        found = self.data.find(bytes(length), candidate)
+        if found != -1:
+            self.alloc_ptr = found + length
+            return found
 
         # if no free block found, raise an error
         raise MemoryError("No free memory block available.")
\ No newline at end of file
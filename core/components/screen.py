@@ -12,37 +12,68 @@ class Screen:
         self.screen_ram_start = memory.SCREEN_RAM_START
         self.screen_ram_size = self.width * self.height  # 16384 bytes
 
+        # 8-bit palette using a 3-3-2 bit mapping, built once
+        i = np.arange(256, dtype=np.uint16)
+        r = ((i >> 5) & 0x07) * 255 // 7  # red: 0-7
+        g = ((i >> 2) & 0x07) * 255 // 7  # green: 0-7
+        b = (i & 0x03) * 255 // 3         # blue: 0-3
+        self.palette = np.stack([r, g, b], axis=-1).astype(np.uint8)
+
+        # per-frame RGB buffer, reused instead of allocating a new one each draw
+        self._rgb = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
         # initialize pygame and create a window, and ticker for frame rate control
         pygame.init()
         self.window = pygame.display.set_mode((self.width * self.scale, self.height * self.scale))
         pygame.display.set_caption("6502 Emulator Screen")
         self.clock = pygame.time.Clock()
 
+        # source and scaled surfaces, reused every frame; the source is converted
+        # to the display format so the scale and blit don't convert pixels again
+        self._src = pygame.Surface((self.width, self.height)).convert()
+        self._scaled = pygame.Surface((self.width * self.scale, self.height * self.scale))
+
+        # front buffer: a private copy of screen RAM, refreshed by latch() only when
+        # screen RAM changed; draw only ever reads this, never the RAM the CPU is writing
+        end = self.screen_ram_start + self.screen_ram_size
+        self._view = memoryview(memory.data)[self.screen_ram_start : end]
+        self._frame = bytearray(self.screen_ram_size)
+        self._pixels = np.frombuffer(self._frame, dtype=np.uint8).reshape((self.height, self.width))
+        self._latched = False  # nothing latched yet, so the first latch always draws
+
         # running state and thread handle
         self.running = True
         self.thread = None
 
+    def latch(self):
+        """copy screen RAM into the front buffer if it changed; returns True when it did."""
+        # bytearray == memoryview is a single memcmp and allocates nothing
+        # (the reverse order, memoryview == bytearray, compares item by item)
+        if self._latched and self._frame == self._view:
+            return False
+        self._frame[:] = self._view
+        self._latched = True
+        return True
+
     def draw(self):
-        """render the current video memory contents using 8-bit (3-3-2) palette mapping."""
-        # read and reshape the screen memory (8-bit per pixel)
-        screen_data = np.frombuffer(
-            self.memory.data[self.screen_ram_start : self.screen_ram_start + self.screen_ram_size],
-            dtype=np.uint8
-        ).reshape((self.height, self.width))
+        """render the latched front buffer using 8-bit (3-3-2) palette mapping."""
+        if not self._latched:
+            self.latch()
 
-        # build 8-bit palette using a 3-3-2 bit mapping
-        palette = np.empty((256, 3), dtype=np.uint8)
-        for i in range(256):
-            r = (i >> 5) & 0x07  # red: 0-7
-            g = (i >> 2) & 0x07  # green: 0-7
-            b = i & 0x03         # blue: 0-3
-            palette[i] = [int(r * 255 / 7), int(g * 255 / 7), int(b * 255 / 3)]
+        # the front buffer viewed as pixels (8-bit per pixel), no copy
+        screen_data = self._pixels
 
-        # map each pixel to its corresponding RGB color using the palette, blit to surface
-        rgb_array = palette[screen_data]
-        surface = pygame.surfarray.make_surface(rgb_array)
-        scaled_surface = pygame.transform.scale(surface, (self.width * self.scale, self.height * self.scale))
-        self.window.blit(scaled_surface, (0, 0))
+        # map each pixel to its corresponding RGB color using the palette, blit to surface;
+        # mode='clip' writes straight into out (the default 'raise' goes through a temporary),
+        # and uint8 indices into a 256-entry palette never actually clip
+        rgb_array = np.take(self.palette, screen_data, axis=0, out=self._rgb, mode='clip')
+        # write straight into the source surface's pixels; the view is dropped
+        # again before scaling since it keeps the surface locked
+        view = pygame.surfarray.pixels3d(self._src)
+        view[...] = rgb_array
+        del view
+        pygame.transform.scale(self._src, self._scaled.get_size(), self._scaled)
+        self.window.blit(self._scaled, (0, 0))
         pygame.display.flip()
 
     def run(self):
@@ -51,7 +82,11 @@ class Screen:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
-            self.draw()
+
+            # only redraw when screen RAM changed; the CPU writes RAM directly,
+            # so compare a snapshot (one memcmp) rather than relying on Memory.write
+            if self.latch():
+                self.draw()
             self.clock.tick(120)
 
     def start(self):
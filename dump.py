@@ -43,10 +43,10 @@ def main():
     # write hex dump if requested
     if output_type in ("hex", "both"):
         hexpath = path.join(bin_dir, path.splitext(path.basename(asmfile))[0] + '.hex')
+        # build every line first so the file gets a single write
+        lines = [f"${asm.image_base + i:04X}: {b:02X}\n" for i, b in enumerate(code)]
         with open(hexpath, 'w') as f:
-            for i, b in enumerate(code):
-                addr = asm.origin + i
-                f.write(f"${addr:04X}: {b:02X}\n")
+            f.write("".join(lines))
                 
         print(f"[green]Hex dump written to: {hexpath}[/green]")
 
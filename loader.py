@@ -1,5 +1,7 @@
-from sys import argv, stdin
+from sys import argv, stdin, stdout
+from collections import deque
 import os
+import threading
 import pygame
 
 # assembler and components
@@ -12,6 +14,43 @@ from core.components.screen import Screen
 from rich import print
 
 printdata = False  # set to True to print all data in ROM after execution
+BATCH_SIZE = 10000  # instructions executed per run_n call
+OUTPUT_LIMIT = 512  # buffered output characters before a forced flush
+
+
+# i/o handlers are plain module-level functions rather than lambdas
+# characters written to $D020, flushed on newline, when full, on input, and after each batch
+output_buffer = []
+
+def flush_output():
+    """write any buffered $D020 output to stdout in one call."""
+    if output_buffer:
+        stdout.write(''.join(output_buffer))
+        stdout.flush()
+        output_buffer.clear()
+
+def print_char(addr, val):
+    """write handler for $D020: buffer the byte as a character."""
+    output_buffer.append(chr(val))
+    if val == 0x0A or len(output_buffer) >= OUTPUT_LIMIT:
+        flush_output()
+
+# bytes read from stdin by a background thread, waiting for the program
+input_buffer = deque()
+
+def fill_input():
+    """background thread: move stdin into input_buffer in 4 KB chunks until EOF."""
+    fd = stdin.fileno()
+    while True:
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            break
+        input_buffer.extend(chunk)
+
+def read_char(addr):
+    """read handler for $D010: next input byte, or $FF when none is waiting."""
+    flush_output()  # show any prompt before the program waits on input
+    return input_buffer.popleft() if input_buffer else 0xFF
 
 
 def main():
@@ -29,7 +68,7 @@ def main():
         
         # put code in a bytearray and set origin to default $A000
         code = bytearray(data)
-        origin = 0xA000
+        origin = entry = 0xA000
         print(f"Loaded raw ROM '{filepath}' ({len(code)} bytes) at default origin ${origin:04X}")
 
     else:
@@ -39,37 +78,44 @@ def main():
 
         asm = Assembler()
         code = asm.assemble(program_text)
-        origin = getattr(asm, 'origin', 0xA000) or 0xA000
-        print(f"Assembled '{filepath}' ({len(code)} bytes) at origin ${origin:04X}")
+        # the image loads at its lowest emitted address (which can be $0000, e.g. data
+        # below the code), but execution starts at the first instruction
+        origin = asm.image_base
+        entry = asm.entry
+        print(f"Assembled '{filepath}' ({len(code)} bytes) at origin ${origin:04X}, entry ${entry:04X}")
 
     # initialize memory and load ROM
     mem = Memory()
     mem.load_rom(code, origin)
 
     # register print handler at $D020 (for output)
-    mem.register_write_handler(0xD020, lambda addr, val: print(chr(val), end='', flush=True))
+    mem.register_write_handler(0xD020, print_char)
 
     # register read handler at $D010 (for input)
-    mem.register_read_handler(0xD010, lambda addr: ord(stdin.read(1)))
+    mem.register_read_handler(0xD010, read_char)
+    threading.Thread(target=fill_input, daemon=True).start()
 
     # init cpu
     cpu = CPU(mem)
-    cpu.PC = origin
+    cpu.PC = entry
 
     # start the screen separately
     screen = Screen(mem)
     screen.start()
 
-    # run the program (ending when cpu.PC equals 0x00)
-    while True:
-        try:
-            if cpu.read(cpu.PC) == 0x00:
-                cpu.step()  # execute BRK
+    # run the program in batches until a BRK halts the cpu; buffered output is
+    # flushed after every batch, and in the finally so an error can't swallow it
+    try:
+        while not cpu.halted:
+            try:
+                cpu.run_n(BATCH_SIZE)
+                flush_output()
+            except KeyboardInterrupt:
+                flush_output()
+                print("\n[bold red]Execution interrupted by user.[/bold red]")
                 break
-            cpu.step()
-        except KeyboardInterrupt:
-            print("\n[bold red]Execution interrupted by user.[/bold red]")
-            break
+    finally:
+        flush_output()
     
     # keep screen up when BRK is reached until user closes it
     while screen.running: